@@ -1,12 +1,21 @@
 import os
 import re
+import html
+import asyncio
+import difflib
+import hashlib
+import functools
 import logging
+import threading
 from datetime import datetime, timezone
-import requests
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import httpx
+import orjson
+from bs4 import BeautifulSoup, SoupStrainer
+from cachetools import TTLCache
 from telegram import Update
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
-from notion_client import Client
+from notion_client import AsyncClient
 import anthropic
 
 # Configure logging
@@ -22,9 +31,94 @@ NOTION_TOKEN = os.environ.get("NOTION_TOKEN")
 NOTION_DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 
+# Claude models: a small fast model for category-only classification, and
+# Sonnet where the title quality matters
+CLASSIFIER_MODEL = "claude-haiku-4-5-20251001"
+SUMMARY_MODEL = "claude-sonnet-4-20250514"
+
+# Long-lived HTTP/2 connection pools, kept alive between messages
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=300)
+
 # Initialize clients
-notion = Client(auth=NOTION_TOKEN)
-claude = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+_notion_http = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS)
+notion = AsyncClient(auth=NOTION_TOKEN, client=_notion_http)
+_claude_http = anthropic.DefaultAsyncHttpxClient(http2=True, limits=HTTP_LIMITS)
+claude = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY, http_client=_claude_http)
+
+# Shared async HTTP client so repeat hosts reuse pooled keep-alive connections
+_http = httpx.AsyncClient(
+    timeout=10,
+    follow_redirects=True,
+    headers={
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    },
+    transport=httpx.AsyncHTTPTransport(http2=True, retries=3, limits=HTTP_LIMITS)
+)
+
+# Cache of Claude results keyed on the normalized prompt input, so reshared
+# links and repeated titles skip the API call entirely
+_claude_cache = TTLCache(maxsize=2048, ttl=86400)
+_claude_cache_lock = threading.Lock()
+
+# Category options rarely change, so the Notion lookup (and the prompts built
+# from it) is reused for a few minutes
+_categories_cache = TTLCache(maxsize=1, ttl=300)
+
+# Cache of fetched URL content keyed on the normalized URL
+_url_cache = TTLCache(maxsize=1024, ttl=3600)
+_url_cache_lock = threading.Lock()
+
+# Query parameters that only track the share and don't change the page
+TRACKING_PARAMS = {"fbclid", "gclid"}
+
+# Notion saves are queued and written by notion_worker, off the reply path
+_notion_queue: asyncio.Queue = asyncio.Queue()
+_notion_worker_task: asyncio.Task | None = None
+NOTION_CONCURRENCY = 4
+
+# Fire-and-forget tasks, referenced here so they aren't garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+# Preconnecting is only an optimization, so give up on it quickly and skip
+# it while the last preconnect's connection should still be pooled
+PRECONNECT_TIMEOUT = 2
+_claude_warm_until = 0.0
+
+# Hosts whose category is obvious, so Claude can be skipped. A hint is only
+# used if the category exists in the Notion database.
+DOMAIN_CATEGORY_HINTS: dict[str, str] = {
+    "github.com": "Vibe Coding",
+    "gist.github.com": "Vibe Coding",
+    "figma.com": "Good Design",
+    "dribbble.com": "Good Design",
+    "behance.net": "Good Design",
+    "headspace.com": "Mental Health",
+    "calm.com": "Mental Health",
+    "strava.com": "Fitness",
+}
+
+# Only the <head> metadata is needed, so parse just these tags from the
+# first chunk of the page
+_HEAD_STRAINER = SoupStrainer(['meta', 'title'])
+
+# Bounds on a page fetch: bytes read, connect/read timeouts, and total time
+MAX_BODY_BYTES = 131072
+FETCH_TIMEOUT = httpx.Timeout(7, connect=3)
+FETCH_DEADLINE = 10
+
+# Regex fast path for head metadata, run on the raw bytes before falling
+# back to BeautifulSoup. A ">" inside a quoted attribute doesn't end a meta tag.
+# Every repeat is bounded so a page of unterminated tags can't make a match
+# scan to the end of the body from each "<meta".
+_META_TAG_RE = re.compile(
+    rb'<meta\s(?:[^>"\']|"[^"]{0,4096}"|\'[^\']{0,4096}\'){0,128}>', re.IGNORECASE
+)
+_META_ATTR_RE = re.compile(rb'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+_TITLE_RE = re.compile(rb'<title[^>]{0,256}>([^<]{1,300})</title>', re.IGNORECASE)
+_CHARSET_RE = re.compile(rb'<meta[^>]{0,512}?charset\s*=\s*["\']?([\w-]+)', re.IGNORECASE)
+
+# Meta tags to use as page content, in priority order
+META_PRIORITY = (b'og:description', b'twitter:description', b'description', b'og:title')
 
 # URL pattern
 URL_PATTERN = re.compile(r'https?://[^\s]+')
@@ -39,6 +133,17 @@ NOISE_PATTERNS = [
     r'[,，]?\s*点击链接.*$',
 ]
 
+# All noise patterns compiled into one alternation so the text is scanned once
+_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in NOISE_PATTERNS), re.IGNORECASE)
+
+# Twitter/X status URL, capturing the status ID
+_TWITTER_RE = re.compile(r'^https?://(?:[\w-]+\.)*(?:twitter|x)\.com/\w+/status/(\d+)', re.IGNORECASE)
+
+# The oembed HTML is a fixed-shape blockquote with the tweet text in <p> tags
+_OEMBED_BLOCKQUOTE_RE = re.compile(r'<blockquote[^>]*twitter-tweet[^>]*>(.*?)</blockquote>', re.DOTALL)
+_OEMBED_P_RE = re.compile(r'<p[^>]*>(.*?)</p>', re.DOTALL)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
 
 def extract_message_parts(message: str) -> tuple[str | None, str | None, bool]:
     """
@@ -50,6 +155,10 @@ def extract_message_parts(message: str) -> tuple[str | None, str | None, bool]:
         - If pure URL only: (None, url, True)
         - If no URL found: (None, None, False)
     """
+    # Every URL contains "http", so plain notes skip the regex entirely
+    if 'http' not in message:
+        return None, None, False
+
     # Find URL in message
     url_match = URL_PATTERN.search(message)
     if not url_match:
@@ -61,8 +170,7 @@ def extract_message_parts(message: str) -> tuple[str | None, str | None, bool]:
     text_before_url = message[:url_match.start()].strip()
 
     # Remove noise patterns
-    for pattern in NOISE_PATTERNS:
-        text_before_url = re.sub(pattern, '', text_before_url, flags=re.IGNORECASE).strip()
+    text_before_url = _NOISE_RE.sub('', text_before_url).strip()
 
     # Check if there's meaningful text
     if text_before_url and len(text_before_url) > 2:
@@ -71,31 +179,69 @@ def extract_message_parts(message: str) -> tuple[str | None, str | None, bool]:
         return None, url, True
 
 
-def fetch_twitter_content(url: str) -> str | None:
+def run_in_background(coro) -> None:
+    """Start a coroutine without waiting for it, keeping a reference until done."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def preconnect_claude() -> None:
+    """Open a pooled connection to the Anthropic API ahead of the first call."""
+    global _claude_warm_until
+    now = asyncio.get_running_loop().time()
+    if now < _claude_warm_until:
+        return
+    try:
+        await _claude_http.head(str(claude.base_url), timeout=PRECONNECT_TIMEOUT)
+        _claude_warm_until = now + HTTP_LIMITS.keepalive_expiry
+    except Exception as e:
+        logger.warning(f"Failed to preconnect to Claude: {e}")
+
+
+def extract_tweet_text(embed_html: str) -> str | None:
+    """
+    Extract the tweet text from oembed HTML.
+    Uses regexes on the known blockquote shape, falling back to BeautifulSoup.
+    """
+    blockquote = _OEMBED_BLOCKQUOTE_RE.search(embed_html)
+    if blockquote:
+        paragraphs = _OEMBED_P_RE.findall(blockquote.group(1))
+        tweet_text = ' '.join(html.unescape(_HTML_TAG_RE.sub('', p)) for p in paragraphs)
+        if tweet_text.strip():
+            return tweet_text.strip()
+
+    soup = BeautifulSoup(embed_html, 'html.parser')
+    # Get the tweet text (usually in a <p> tag within the blockquote)
+    blockquote = soup.find('blockquote')
+    if blockquote:
+        # Find all <p> tags which contain the tweet text
+        paragraphs = blockquote.find_all('p')
+        tweet_text = ' '.join(p.get_text() for p in paragraphs)
+        if tweet_text.strip():
+            return tweet_text.strip()
+
+    return None
+
+
+async def fetch_twitter_content(url: str) -> str | None:
     """
     Fetch content from Twitter/X using the oembed API.
     Returns the tweet text content.
     """
     try:
         # Use Twitter's oembed API to get tweet content
-        oembed_url = f"https://publish.twitter.com/oembed?url={url}"
-        response = requests.get(oembed_url, timeout=10)
+        response = await _http.get("https://publish.twitter.com/oembed", params={"url": url})
         response.raise_for_status()
 
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # The 'html' field contains the tweet embed HTML
         # Extract text content from it
         if 'html' in data:
-            soup = BeautifulSoup(data['html'], 'html.parser')
-            # Get the tweet text (usually in a <p> tag within the blockquote)
-            blockquote = soup.find('blockquote')
-            if blockquote:
-                # Find all <p> tags which contain the tweet text
-                paragraphs = blockquote.find_all('p')
-                tweet_text = ' '.join(p.get_text() for p in paragraphs)
-                if tweet_text:
-                    return tweet_text.strip()
+            tweet_text = extract_tweet_text(data['html'])
+            if tweet_text:
+                return tweet_text
 
         # Fallback to author_name if available
         if 'author_name' in data:
@@ -110,114 +256,335 @@ def fetch_twitter_content(url: str) -> str | None:
 
 def is_twitter_url(url: str) -> bool:
     """Check if URL is a Twitter/X URL."""
-    return bool(re.search(r'(twitter\.com|x\.com)/\w+/status/\d+', url))
+    return bool(_TWITTER_RE.search(url))
 
 
-def fetch_url_content(url: str) -> str | None:
+def normalize_url(url: str) -> str:
     """
-    Fetch content from URL.
-    Handles Twitter/X specially using oembed API.
+    Normalize a URL for use as a cache key.
+    Lowercases the host and drops tracking params (utm_*, fbclid, gclid).
+    Twitter/X status URLs collapse to their status ID so both hosts dedupe.
     """
-    # Handle Twitter/X URLs specially
-    if is_twitter_url(url):
-        content = fetch_twitter_content(url)
-        if content:
-            return content
-        # Fall through to generic fetching if Twitter API fails
+    status_match = _TWITTER_RE.search(url)
+    if status_match:
+        return f"twitter:status/{status_match.group(1)}"
+
+    parts = urlsplit(url)
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
 
+
+async def fetch_url_content(url: str) -> str | None:
+    """
+    Fetch content from URL, serving repeat URLs from the cache.
+    """
+    cache_key = normalize_url(url)
+    with _url_cache_lock:
+        cached = _url_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"URL content cache hit: {cache_key}")
+        return cached
+
+    content = await download_url_content(url)
+    if content:
+        with _url_cache_lock:
+            _url_cache[cache_key] = content
+    return content
+
+
+def decode_html_text(raw: bytes, encoding: str) -> str:
+    """Decode a raw HTML text fragment and unescape its entities."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        text = raw.decode(encoding, errors='replace')
+    except LookupError:
+        text = raw.decode('utf-8', errors='replace')
+    return html.unescape(text).strip()
+
+
+def extract_head_content(body: bytes, encoding: str) -> str | None:
+    """
+    Extract the page description or title from raw HTML using regexes.
+    Returns None if nothing usable was found.
+    """
+    found = {}
+    for tag in _META_TAG_RE.finditer(body):
+        attrs = {}
+        for attr in _META_ATTR_RE.finditer(tag.group()):
+            value = next((v for v in attr.group(2, 3, 4) if v is not None), b'')
+            attrs[attr.group(1).lower()] = value
+        key = (attrs.get(b'property') or attrs.get(b'name') or b'').lower()
+        content = attrs.get(b'content', b'').strip()
+        if key in META_PRIORITY and content and key not in found:
+            found[key] = content
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+    for key in META_PRIORITY:
+        if key in found:
+            return decode_html_text(found[key], encoding)
 
-        # Try to get og:description (works well for many sites)
-        og_desc = soup.find('meta', property='og:description')
-        if og_desc and og_desc.get('content'):
-            return og_desc['content']
+    title_match = _TITLE_RE.search(body)
+    if title_match and title_match.group(1).strip():
+        return decode_html_text(title_match.group(1), encoding)
 
-        # Try twitter:description
-        twitter_desc = soup.find('meta', attrs={'name': 'twitter:description'})
-        if twitter_desc and twitter_desc.get('content'):
-            return twitter_desc['content']
+    return None
 
-        # Try regular meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            return meta_desc['content']
 
-        # Try og:title as fallback
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            return og_title['content']
+def extract_head_content_with_soup(body: bytes) -> str | None:
+    """
+    Extract the page description or title by parsing the HTML head.
+    Slower fallback for pages the regexes can't handle.
+    """
+    soup = BeautifulSoup(body, 'lxml', parse_only=_HEAD_STRAINER)
 
-        # Try page title as last resort
-        title_tag = soup.find('title')
-        if title_tag and title_tag.string:
-            return title_tag.string.strip()
+    # Try to get og:description (works well for many sites)
+    og_desc = soup.find('meta', property='og:description')
+    if og_desc and og_desc.get('content'):
+        return og_desc['content']
 
-        return None
+    # Try twitter:description
+    twitter_desc = soup.find('meta', attrs={'name': 'twitter:description'})
+    if twitter_desc and twitter_desc.get('content'):
+        return twitter_desc['content']
+
+    # Try regular meta description
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc and meta_desc.get('content'):
+        return meta_desc['content']
+
+    # Try og:title as fallback
+    og_title = soup.find('meta', property='og:title')
+    if og_title and og_title.get('content'):
+        return og_title['content']
+
+    # Try page title as last resort
+    title_tag = soup.find('title')
+    if title_tag and title_tag.string:
+        return title_tag.string.strip()
+
+    return None
+
+
+def parse_head_content(body: bytes, encoding: str | None) -> str | None:
+    """
+    Extract the page description or title from a downloaded page,
+    trying the regexes first and BeautifulSoup second.
+    """
+    if not encoding:
+        charset_match = _CHARSET_RE.search(body)
+        encoding = charset_match.group(1).decode('ascii') if charset_match else 'utf-8'
+    return extract_head_content(body, encoding) or extract_head_content_with_soup(body)
+
+
+async def download_url_content(url: str) -> str | None:
+    """
+    Fetch content from URL.
+    Handles Twitter/X specially using oembed API.
+    """
+    # Handle Twitter/X URLs specially
+    if is_twitter_url(url):
+        content = await fetch_twitter_content(url)
+        if content:
+            return content
+        # Fall through to generic fetching if Twitter API fails
+
+    try:
+        body = bytearray()
+        async with asyncio.timeout(FETCH_DEADLINE):
+            async with _http.stream("GET", url, timeout=FETCH_TIMEOUT) as response:
+                response.raise_for_status()
+                # Meta tags live in <head>, so skip downloading the article body
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= MAX_BODY_BYTES:
+                        break
+                encoding = response.charset_encoding
+        body = bytes(body[:MAX_BODY_BYTES])
+
+        # Parsing is CPU-bound, so keep it off the event loop
+        return await asyncio.to_thread(parse_head_content, body, encoding)
 
     except Exception as e:
         logger.error(f"Failed to fetch URL content: {e}")
         return None
 
 
-def get_categories() -> list[str]:
+async def get_categories() -> list[str]:
     """Fetch category options from the Notion database Category property."""
+    cached = _categories_cache.get("categories")
+    if cached is not None:
+        return cached
+
     try:
-        db = notion.databases.retrieve(database_id=NOTION_DATABASE_ID)
+        db = await notion.databases.retrieve(database_id=NOTION_DATABASE_ID)
         category_prop = db["properties"].get("Category", {})
         if category_prop.get("type") == "select":
             options = category_prop["select"].get("options", [])
-            return [opt["name"] for opt in options]
+            categories = [opt["name"] for opt in options]
+            _categories_cache["categories"] = categories
+            return categories
         return []
     except Exception as e:
         logger.error(f"Failed to fetch categories from Notion: {e}")
         return []
 
 
-def get_category_from_claude(title: str) -> str:
+# Both system prompts carry a cache_control marker, but at ~100 tokens they
+# are far below the minimum cacheable length (1024 tokens for Sonnet 4, 4096
+# for Haiku 4.5), so the API currently ignores it and cache_read stays 0. The
+# marker only takes effect if the prompts grow past that minimum, e.g. with a
+# very long category list.
+@functools.lru_cache(maxsize=8)
+def build_category_system_prompt(categories: tuple[str, ...]) -> list[dict]:
+    """
+    Build the system prompt for category-only requests.
+    The categories list is the static prefix; only the title varies per call.
+    """
+    categories_list = "\n".join(f"{i+1}. {c}" for i, c in enumerate(categories))
+    return [
+        {
+            "type": "text",
+            "text": f"""Based on the title provided, assign ONE category from this list:
+{categories_list}
+
+Respond with ONLY the number of the category, nothing else.""",
+            "cache_control": {"type": "ephemeral"}
+        }
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def build_title_category_system_prompt(categories: tuple[str, ...]) -> list[dict]:
+    """
+    Build the system prompt for title + category requests.
+    The categories list is the static prefix; only the content varies per call.
+    """
+    categories_list = "\n".join(f"- {c}" for c in categories)
+    return [
+        {
+            "type": "text",
+            "text": f"""Based on the content provided, provide:
+1. A concise title (under 50 characters, match the source language - if content is Chinese, title should be Chinese)
+2. A category from this list ONLY:
+{categories_list}
+
+Respond in this exact format (two lines only):
+TITLE: [your title here]
+CATEGORY: [category exactly as shown above]""",
+            "cache_control": {"type": "ephemeral"}
+        }
+    ]
+
+
+def default_category(categories: list[str]) -> str:
+    """Category to fall back on when Claude's answer can't be used."""
+    return categories[0] if categories else "Uncategorized"
+
+
+@functools.lru_cache(maxsize=8)
+def category_lookup(categories: tuple[str, ...]) -> dict[str, str]:
+    """Map lowercased category names to their canonical spelling."""
+    return {c.lower(): c for c in categories}
+
+
+def match_category(answer: str, categories: list[str]) -> str | None:
+    """
+    Match Claude's answer to a category by its number, exact name,
+    or closest name. Returns None if nothing matches.
+    """
+    answer = answer.strip().rstrip(".").lower()
+    if answer.isdigit():
+        index = int(answer) - 1
+        return categories[index] if 0 <= index < len(categories) else None
+
+    lookup = category_lookup(tuple(categories))
+    if answer in lookup:
+        return lookup[answer]
+    close = difflib.get_close_matches(answer, lookup.keys(), n=1)
+    return lookup[close[0]] if close else None
+
+
+def log_cache_usage(message) -> None:
+    """Log input tokens and any prompt cache reads/writes."""
+    usage = getattr(message, "usage", None)
+    if usage is None:
+        return
+    logger.info(
+        f"Claude usage: input={usage.input_tokens}, "
+        f"cache_read={getattr(usage, 'cache_read_input_tokens', None) or 0}, "
+        f"cache_write={getattr(usage, 'cache_creation_input_tokens', None) or 0}"
+    )
+
+
+def claude_cache_key(kind: str, text: str, categories: list[str]) -> str:
+    """Build a cache key from normalized text (whitespace/case) and the category list."""
+    normalized = " ".join(text.split()).lower()
+    key = hashlib.blake2b(digest_size=16)
+    for part in (kind, "\n".join(categories), normalized):
+        key.update(part.encode())
+        key.update(b"\0")
+    return key.hexdigest()
+
+
+def get_cached_claude_result(key: str):
+    """Return a cached Claude result, or None on a miss."""
+    with _claude_cache_lock:
+        return _claude_cache.get(key)
+
+
+def set_cached_claude_result(key: str, result) -> None:
+    """Store a Claude result in the cache."""
+    with _claude_cache_lock:
+        _claude_cache[key] = result
+
+
+async def get_category_from_domain(url: str) -> str | None:
+    """Return the hinted category for a well-known host, or None."""
+    host = urlsplit(url).netloc.lower().removeprefix('www.')
+    category = DOMAIN_CATEGORY_HINTS.get(host)
+    if category and category in await get_categories():
+        return category
+    return None
+
+
+async def get_category_from_claude(title: str) -> str:
     """
     Use Claude to assign a category based on the title.
     """
     try:
-        categories = get_categories()
-        categories_list = "\n".join(f"- {c}" for c in categories)
-        message = claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=50,
+        categories = await get_categories()
+        cache_key = claude_cache_key("category", title, categories)
+        cached = get_cached_claude_result(cache_key)
+        if cached is not None:
+            logger.info("Category cache hit")
+            return cached
+
+        message = await claude.messages.create(
+            model=CLASSIFIER_MODEL,
+            max_tokens=2,
+            system=build_category_system_prompt(tuple(categories)),
             messages=[
                 {
                     "role": "user",
-                    "content": f"""Based on this title, assign ONE category from this list:
-{categories_list}
-
-Title: {title}
-
-Respond with ONLY the category name exactly as shown above, nothing else."""
+                    "content": f"Title: {title}"
                 }
             ]
         )
-        category = message.content[0].text.strip()
-        # Validate category is in the list
-        if category in categories:
-            return category
-        # Try to find a close match
-        for c in categories:
-            if c.lower() in category.lower() or category.lower() in c.lower():
-                return c
-        return categories[0] if categories else "Uncategorized"
+        log_cache_usage(message)
+        category = match_category(message.content[0].text, categories)
+        if not category:
+            # Don't cache the fallback, so the next request asks Claude again
+            return default_category(categories)
+
+        set_cached_claude_result(cache_key, category)
+        return category
     except Exception as e:
         logger.error(f"Failed to get category from Claude: {e}")
-        categories = get_categories()
-        return categories[0] if categories else "Uncategorized"
+        return default_category(await get_categories())
 
 
-def get_title_and_category_from_claude(content: str, url: str) -> tuple[str, str]:
+async def get_title_and_category_from_claude(content: str, url: str) -> tuple[str, str]:
     """
     Use Claude to create a title and assign a category based on content.
     Works for both URL-fetched content and plain text input.
@@ -227,59 +594,58 @@ def get_title_and_category_from_claude(content: str, url: str) -> tuple[str, str
         if len(content) > 2000:
             content = content[:2000] + "..."
 
-        categories = get_categories()
-        categories_list = "\n".join(f"- {c}" for c in categories)
-        source_line = f"\nURL: {url}" if url else ""
-        message = claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=200,
+        categories = await get_categories()
+        source_line = f"URL: {url}\n" if url else ""
+        cache_key = claude_cache_key("title_category", source_line + content, categories)
+        cached = get_cached_claude_result(cache_key)
+        if cached is not None:
+            logger.info("Title/category cache hit")
+            return cached
+
+        message = await claude.messages.create(
+            model=SUMMARY_MODEL,
+            max_tokens=150,
+            system=build_title_category_system_prompt(tuple(categories)),
             messages=[
                 {
                     "role": "user",
-                    "content": f"""Based on this content, provide:
-1. A concise title (under 50 characters, match the source language - if content is Chinese, title should be Chinese)
-2. A category from this list ONLY:
-{categories_list}
-{source_line}
-Content: {content}
-
-Respond in this exact format (two lines only):
-TITLE: [your title here]
-CATEGORY: [category exactly as shown above]"""
+                    "content": f"{source_line}Content: {content}"
                 }
             ]
         )
+        log_cache_usage(message)
 
         response_text = message.content[0].text.strip()
         lines = response_text.split('\n')
 
         title = "Untitled"
-        default_category = categories[0] if categories else "Uncategorized"
-        category = default_category
+        category = None
 
         for line in lines:
             if line.startswith("TITLE:"):
                 title = line.replace("TITLE:", "").strip()
             elif line.startswith("CATEGORY:"):
-                cat = line.replace("CATEGORY:", "").strip()
                 # Validate category
-                if cat in categories:
-                    category = cat
-                else:
-                    for c in categories:
-                        if c.lower() in cat.lower() or cat.lower() in c.lower():
-                            category = c
-                            break
-
+                category = match_category(line.replace("CATEGORY:", ""), categories)
+
+        # Only cache complete replies whose category matched; a cut-off or
+        # unusable reply is used once (with the default category) but not kept
+        truncated = message.stop_reason == "max_tokens"
+        if truncated:
+            logger.warning("Title/category reply hit max_tokens, not caching it")
+        if category is None:
+            return title, default_category(categories)
+
+        if not truncated:
+            set_cached_claude_result(cache_key, (title, category))
         return title, category
 
     except Exception as e:
         logger.error(f"Failed to get title and category from Claude: {e}")
-        categories = get_categories()
-        return "Untitled", categories[0] if categories else "Uncategorized"
+        return "Untitled", default_category(await get_categories())
 
 
-def save_to_notion(title: str, category: str, content: str) -> tuple[bool, str, str | None]:
+async def save_to_notion(title: str, category: str, content: str) -> tuple[bool, str, str | None]:
     """Save entry to Notion database. Content can be a URL or plain text.
 
     Returns:
@@ -322,7 +688,7 @@ def save_to_notion(title: str, category: str, content: str) -> tuple[bool, str,
                 ]
             }
 
-        page = notion.pages.create(
+        page = await notion.pages.create(
             parent={"database_id": NOTION_DATABASE_ID},
             properties=properties
         )
@@ -332,10 +698,61 @@ def save_to_notion(title: str, category: str, content: str) -> tuple[bool, str,
         return False, str(e), None
 
 
-def update_notion_category(page_id: str, new_category: str) -> tuple[bool, str]:
+async def process_notion_job(job: tuple, semaphore: asyncio.Semaphore) -> None:
+    """Save one queued entry to Notion and report the result on its status message."""
+    title, category, content, status_message, user_data, seq = job
+    try:
+        success, error, page_id = await save_to_notion(title, category, content)
+
+        if success and user_data.get("message_seq") == seq:
+            # Saves can finish out of order, so only the user's newest
+            # message becomes the pending category edit
+            user_data["pending_category_edit"] = {
+                "page_id": page_id,
+                "title": title,
+                "category": category
+            }
+
+            category_list = await format_category_options()
+            await status_message.edit_text(
+                f"✅ Saved to Notion\n"
+                f"Title: {title}\n"
+                f"Category: {category}\n\n"
+                f"Reply with a number to change category:\n{category_list}"
+            )
+        elif success:
+            await status_message.edit_text(
+                f"✅ Saved to Notion\n"
+                f"Title: {title}\n"
+                f"Category: {category}"
+            )
+        else:
+            await status_message.edit_text(
+                f"❌ Failed to save to Notion:\n{error}"
+            )
+    except Exception as e:
+        logger.error(f"Error processing queued Notion save: {e}")
+    finally:
+        semaphore.release()
+        _notion_queue.task_done()
+
+
+async def notion_worker() -> None:
+    """Drain the Notion queue, pipelining up to NOTION_CONCURRENCY saves at once."""
+    semaphore = asyncio.Semaphore(NOTION_CONCURRENCY)
+    tasks = set()
+    while True:
+        job = await _notion_queue.get()
+        await semaphore.acquire()
+        task = asyncio.create_task(process_notion_job(job, semaphore))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+
+async def update_notion_category(page_id: str, new_category: str) -> tuple[bool, str]:
     """Update the category of an existing Notion page."""
     try:
-        notion.pages.update(
+        await notion.pages.update(
             page_id=page_id,
             properties={
                 "Category": {
@@ -351,9 +768,10 @@ def update_notion_category(page_id: str, new_category: str) -> tuple[bool, str]:
         return False, str(e)
 
 
-def format_category_options() -> str:
+async def format_category_options() -> str:
     """Format categories as a numbered list for display."""
-    return "\n".join(f"{i+1}. {cat}" for i, cat in enumerate(get_categories()))
+    categories = await get_categories()
+    return "\n".join(f"{i+1}. {cat}" for i, cat in enumerate(categories))
 
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -364,7 +782,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Check if this is a category selection reply (single number 1-7)
     if text.isdigit():
         num = int(text)
-        categories = get_categories()
+        categories = await get_categories()
         if 1 <= num <= len(categories):
             # Check if there's a pending category edit
             pending = context.user_data.get("pending_category_edit")
@@ -382,7 +800,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
                     )
                     return
 
-                success, error = update_notion_category(page_id, new_category)
+                success, error = await update_notion_category(page_id, new_category)
                 if success:
                     await update.message.reply_text(
                         f"✅ Category updated: {old_category} → {new_category}"
@@ -396,58 +814,57 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Clear any pending category edit when processing new content
     if "pending_category_edit" in context.user_data:
         del context.user_data["pending_category_edit"]
+    seq = context.user_data.get("message_seq", 0) + 1
+    context.user_data["message_seq"] = seq
 
     # Extract message parts
     title, url, needs_fetching = extract_message_parts(text)
 
     # Send processing indicator
-    await update.message.reply_text("⏳ Processing...")
+    status_message = await update.message.reply_text("⏳ Processing...")
 
     try:
         if not url:
             # TYPE C: Pure text - no URL, use text as content, generate title and category
             logger.info(f"Type C: Pure text detected")
-            title, category = get_title_and_category_from_claude(text, "")
+            title, category = await get_title_and_category_from_claude(text, "")
             content_to_save = text
         elif needs_fetching:
             # TYPE B: Pure URL - need to fetch content and get both title and category
-            logger.info(f"Type B: Pure URL detected, fetching content from {url}")
-            content = fetch_url_content(url)
+            urls = list(dict.fromkeys(URL_PATTERN.findall(text)))
+            logger.info(f"Type B: Pure URL detected, fetching content from {', '.join(urls)}")
+            # Warm the Claude connection in the background while every URL
+            # is fetched concurrently
+            run_in_background(preconnect_claude())
+            results = await asyncio.gather(*(fetch_url_content(u) for u in urls))
+            content = "\n\n".join(r for r in results if r)
+            source = "\n".join(urls)
 
             if content:
-                title, category = get_title_and_category_from_claude(content, url)
+                title, category = await get_title_and_category_from_claude(content, source)
             else:
                 # If we couldn't fetch content, use URL domain as hint
-                title, category = get_title_and_category_from_claude(f"URL: {url}", url)
-            content_to_save = url
+                title, category = await get_title_and_category_from_claude(f"URL: {source}", source)
+            content_to_save = source
         else:
             # TYPE A: Has meaningful text - use it as title, just get category
             logger.info(f"Type A: Title detected: {title}")
-            category = get_category_from_claude(title)
+            category = await get_category_from_domain(url)
+            if category:
+                logger.info(f"DIRECT: category {category} from domain hint")
+            else:
+                category = await get_category_from_claude(title)
             content_to_save = url
 
-        # Save to Notion
-        success, error, page_id = save_to_notion(title, category, content_to_save)
-
-        if success:
-            # Store pending category edit info
-            context.user_data["pending_category_edit"] = {
-                "page_id": page_id,
-                "title": title,
-                "category": category
-            }
-
-            category_list = format_category_options()
-            await update.message.reply_text(
-                f"✅ Saved to Notion\n"
-                f"Title: {title}\n"
-                f"Category: {category}\n\n"
-                f"Reply with a number to change category:\n{category_list}"
-            )
-        else:
-            await update.message.reply_text(
-                f"❌ Failed to save to Notion:\n{error}"
-            )
+        # Queue the Notion save; the worker updates the status message when done
+        await status_message.edit_text(
+            f"⏳ Queued\n"
+            f"Title: {title}\n"
+            f"Category: {category}"
+        )
+        await _notion_queue.put(
+            (title, category, content_to_save, status_message, context.user_data, seq)
+        )
 
     except Exception as e:
         logger.error(f"Error processing message: {e}")
@@ -456,6 +873,39 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
 
 
+async def warmup_connections() -> None:
+    """Open the Notion and Claude connections before the first message arrives."""
+    notion_result, _ = await asyncio.gather(
+        notion.users.me(),
+        preconnect_claude(),
+        return_exceptions=True
+    )
+    if isinstance(notion_result, Exception):
+        logger.warning(f"Failed to warm up Notion connection: {notion_result}")
+
+
+async def on_startup(application: Application) -> None:
+    """Start the background Notion worker and warm up API connections."""
+    global _notion_worker_task
+    _notion_worker_task = asyncio.create_task(notion_worker())
+    # Warm up in the background so a slow API can't delay polling
+    run_in_background(warmup_connections())
+
+
+async def stop_notion_worker(application: Application) -> None:
+    """Finish queued Notion saves, then stop the worker."""
+    await _notion_queue.join()
+    if _notion_worker_task:
+        _notion_worker_task.cancel()
+
+
+async def close_clients(application: Application) -> None:
+    """Close the shared HTTP, Claude and Notion clients on shutdown."""
+    await _http.aclose()
+    await claude.close()
+    await notion.aclose()
+
+
 def main() -> None:
     """Start the bot"""
     missing_vars = []
@@ -474,7 +924,15 @@ def main() -> None:
         return
 
     # Create application
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .post_init(on_startup)
+        .post_stop(stop_notion_worker)
+        .post_shutdown(close_clients)
+        .build()
+    )
 
     # Add message handler for text messages
     application.add_handler(
@@ -0,0 +1,51 @@
+"""
+Shared helpers for the setup scripts: .env file loading and ID checks.
+
+.env files are parsed once per (path, mtime, size) and reused until they change.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# KEY=VALUE line, with the value optionally wrapped in single or double quotes.
+# Blank lines and comments don't match.
+_ENV_LINE = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|(.*?))\s*$')
+
+_HYPHENS = str.maketrans("", "", "-")
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+@lru_cache(maxsize=8)
+def _load_env_cached(path: str, mtime_ns: int, size: int) -> tuple[tuple[str, str], ...]:
+    """Parse a .env file; cached until the file's mtime or size changes."""
+    values = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        match = _ENV_LINE.match(line)
+        if match:
+            key, *quoted = match.groups()
+            values[key] = next(v for v in quoted if v is not None)
+    return tuple(values.items())
+
+
+def load_env_file(path: str) -> dict[str, str]:
+    """Load key=value pairs from .env file."""
+    st = os.stat(path)
+    return dict(_load_env_cached(path, st.st_mtime_ns, st.st_size))
+
+
+def load_into_os_environ(path: str) -> None:
+    """Load key=value pairs from a .env file into os.environ."""
+    os.environ.update(load_env_file(path))
+
+
+def strip_hyphens(value: str) -> str:
+    """Remove all hyphens, e.g. from a dashed Notion ID."""
+    return value.translate(_HYPHENS)
+
+
+def is_hex32(value: str) -> bool:
+    """Check whether value is 32 hex characters, ignoring hyphens."""
+    cleaned = strip_hyphens(value)
+    return len(cleaned) == 32 and all(c in _HEX_DIGITS for c in cleaned.lower())
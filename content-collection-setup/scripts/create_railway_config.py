@@ -15,7 +15,9 @@ Usage:
 import os
 import re
 import sys
-import json
+import argparse
+
+from _common import is_hex32, load_env_file, strip_hyphens
 
 
 REQUIRED_VARS = [
@@ -28,7 +30,7 @@ REQUIRED_VARS = [
     {
         "name": "NOTION_TOKEN",
         "prompt": "Notion integration token",
-        "pattern": r"^(ntn_|secret_)",
+        "prefix": ("ntn_", "secret_"),
         "hint": 'Starts with "ntn_" or "secret_"',
     },
     {
@@ -40,34 +42,35 @@ REQUIRED_VARS = [
     {
         "name": "ANTHROPIC_API_KEY",
         "prompt": "Anthropic API key",
-        "pattern": r"^sk-ant-",
+        "prefix": ("sk-ant-",),
         "hint": 'Starts with "sk-ant-"',
     },
 ]
 
+# Compile each validation pattern once instead of on every input attempt.
+# Vars with a "prefix" are checked with str.startswith instead.
+for _var in REQUIRED_VARS:
+    if "pattern" in _var:
+        _var["compiled"] = re.compile(_var["pattern"])
 
-def extract_database_id(raw: str) -> str | None:
-    """Extract 32-char hex database ID from URL or raw string."""
-    cleaned = raw.replace("-", "").strip()
-    match = re.search(r"([a-f0-9]{32})", cleaned)
-    if match:
-        db_id = match.group(1)
-        return f"{db_id[:8]}-{db_id[8:12]}-{db_id[12:16]}-{db_id[16:20]}-{db_id[20:]}"
-    return None
+# Output order of the variable names, shared by the formatters
+_VAR_ORDER: tuple[str, ...] = tuple(v["name"] for v in REQUIRED_VARS)
 
+_DB_ID_RE = re.compile(r"([a-f0-9]{32})(?![a-f0-9])", re.IGNORECASE)
 
-def load_env_file(path: str) -> dict[str, str]:
-    """Load key=value pairs from .env file."""
-    values = {}
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" in line:
-                key, _, value = line.partition("=")
-                values[key.strip()] = value.strip().strip('"').strip("'")
-    return values
+
+def extract_database_id(raw: str) -> str | None:
+    """Extract 32-char hex database ID from URL or raw string."""
+    cleaned = strip_hyphens(raw).strip()
+    if is_hex32(cleaned):
+        # Bare ID - no need to search a URL for it
+        db_id = cleaned.lower()
+    else:
+        match = _DB_ID_RE.search(cleaned)
+        if not match:
+            return None
+        db_id = match.group(1).lower()
+    return f"{db_id[:8]}-{db_id[8:12]}-{db_id[12:16]}-{db_id[16:20]}-{db_id[20:]}"
 
 
 def collect_interactive() -> dict[str, str]:
@@ -93,9 +96,14 @@ def collect_interactive() -> dict[str, str]:
                 else:
                     print(f"  Could not extract database ID. {var['hint']}\n")
                     continue
-            elif not re.search(var["pattern"], value):
-                print(f"  Invalid format. {var['hint']}\n")
-                continue
+            else:
+                if "prefix" in var:
+                    ok = value.startswith(var["prefix"])
+                else:
+                    ok = bool(var["compiled"].search(value))
+                if not ok:
+                    print(f"  Invalid format. {var['hint']}\n")
+                    continue
 
             values[var["name"]] = value
             print()
@@ -104,23 +112,22 @@ def collect_interactive() -> dict[str, str]:
     return values
 
 
+def _ordered_pairs(values: dict[str, str]) -> list[tuple[str, str]]:
+    """Return (name, value) pairs for the set variables, in _VAR_ORDER."""
+    return [(name, values[name]) for name in _VAR_ORDER if name in values]
+
+
 def format_env(values: dict[str, str]) -> str:
     """Format as .env file."""
     lines = ["# Content Collection Bot - Environment Variables", ""]
-    for var in REQUIRED_VARS:
-        name = var["name"]
-        if name in values:
-            lines.append(f"{name}={values[name]}")
+    lines += [f"{name}={value}" for name, value in _ordered_pairs(values)]
     return "\n".join(lines) + "\n"
 
 
 def format_cli(values: dict[str, str]) -> str:
     """Format as Railway CLI commands."""
     lines = ["# Run these commands in your Railway project directory:", ""]
-    for var in REQUIRED_VARS:
-        name = var["name"]
-        if name in values:
-            lines.append(f'railway variables set {name}="{values[name]}"')
+    lines += [f'railway variables set {name}="{value}"' for name, value in _ordered_pairs(values)]
     return "\n".join(lines) + "\n"
 
 
@@ -131,21 +138,15 @@ def format_dashboard(values: dict[str, str]) -> str:
         "# Click 'RAW Editor' and paste the following:",
         "",
     ]
-    for var in REQUIRED_VARS:
-        name = var["name"]
-        if name in values:
-            lines.append(f"{name}={values[name]}")
+    lines += [f"{name}={value}" for name, value in _ordered_pairs(values)]
     return "\n".join(lines) + "\n"
 
 
 def format_json(values: dict[str, str]) -> str:
     """Format as JSON (for Railway API or programmatic use)."""
-    ordered = {}
-    for var in REQUIRED_VARS:
-        name = var["name"]
-        if name in values:
-            ordered[name] = values[name]
-    return json.dumps(ordered, indent=2) + "\n"
+    import json
+
+    return json.dumps(dict(_ordered_pairs(values)), indent=2) + "\n"
 
 
 FORMATTERS = {
@@ -156,35 +157,26 @@ FORMATTERS = {
 }
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--env", help="load values from this .env file instead of prompting")
+    parser.add_argument("--format", default="env", choices=list(FORMATTERS), help="output format")
+    parser.add_argument("--output", help="also write the output to this file")
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
+    env_path = args.env
+    output_format = args.format
+    output_file = args.output
+
     print("=" * 50)
     print("  Railway Configuration Generator")
     print("=" * 50)
 
-    # Parse args
-    env_path = None
-    output_format = "env"
-    output_file = None
-
-    args = sys.argv[1:]
-    i = 0
-    while i < len(args):
-        if args[i] == "--env" and i + 1 < len(args):
-            env_path = args[i + 1]
-            i += 2
-        elif args[i] == "--format" and i + 1 < len(args):
-            output_format = args[i + 1]
-            i += 2
-        elif args[i] == "--output" and i + 1 < len(args):
-            output_file = args[i + 1]
-            i += 2
-        elif args[i] == "--help":
-            print(__doc__)
-            print("Formats: " + ", ".join(FORMATTERS.keys()))
-            sys.exit(0)
-        else:
-            i += 1
-
     # Collect values
     if env_path:
         if not os.path.exists(env_path):
@@ -200,16 +192,11 @@ def main() -> None:
             sys.exit(0)
 
     # Validate we have all vars
-    missing = [v["name"] for v in REQUIRED_VARS if v["name"] not in values]
+    missing = [name for name in _VAR_ORDER if name not in values]
     if missing:
         print(f"\nWARNING: Missing variables: {', '.join(missing)}")
 
     # Format output
-    if output_format not in FORMATTERS:
-        print(f"Unknown format: {output_format}")
-        print("Available: " + ", ".join(FORMATTERS.keys()))
-        sys.exit(1)
-
     label, formatter = FORMATTERS[output_format]
     result = formatter(values)
 